@@ -15,29 +15,29 @@ import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+PYPROJECT = ROOT / "pyproject.toml"
+VERSION_RE = re.compile(r'^version\s*=\s*"(.+?)"', re.MULTILINE)
 
 
-def read_current_version() -> str:
-    text = (ROOT / "pyproject.toml").read_text()
-    match = re.search(r'^version\s*=\s*"(.+?)"', text, re.MULTILINE)
+def read_current_version(text: str | None = None) -> str:
+    if text is None:
+        text = PYPROJECT.read_text()
+    match = VERSION_RE.search(text)
     if not match:
         sys.exit("Error: could not find version in pyproject.toml")
     return match.group(1)
 
 
-def update_pyproject(old: str, new: str) -> None:
-    path = ROOT / "pyproject.toml"
-    text = path.read_text()
+def update_pyproject(text: str, old: str, new: str) -> None:
     updated = text.replace(f'version = "{old}"', f'version = "{new}"', 1)
-    path.write_text(updated)
+    PYPROJECT.write_text(updated)
     print("  Updated pyproject.toml")
 
 
 def update_readme(old: str, new: str) -> None:
     path = ROOT / "README.md"
     text = path.read_text()
-    updated = text.replace(f"rev: v{old}", f"rev: v{new}")
-    count = text.count(f"rev: v{old}")
+    updated, count = re.subn(re.escape(f"rev: v{old}"), f"rev: v{new}", text)
     path.write_text(updated)
     print(f"  Updated README.md ({count} occurrence{'s' if count != 1 else ''})")
 
@@ -60,12 +60,13 @@ def main() -> None:
     if not re.fullmatch(r"\d+\.\d+\.\d+", new_version):
         fail("Error: version must be in X.Y.Z format")
 
-    old_version = read_current_version()
+    pyproject = PYPROJECT.read_text()
+    old_version = read_current_version(pyproject)
     if old_version == new_version:
         fail(f"Version is already {new_version}")
 
     print(f"Bumping version: {old_version} -> {new_version}")
-    update_pyproject(old_version, new_version)
+    update_pyproject(pyproject, old_version, new_version)
     update_readme(old_version, new_version)
     update_uv_lock()
 
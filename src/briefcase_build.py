@@ -2,97 +2,178 @@
 
 from __future__ import annotations
 
+import os
 import re
 import subprocess
 import sys
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TextIO
+
+from briefcase_files import remove_empty_dirs, walk_files
 
 CONFIG_SRC = "config-src"
 CONFIG_OUT = "config"
 INCLUDES_DIR = "_includes"
-INCLUDE_RE = re.compile(r"^\{\{include\s+(.+?)\}\}[ \t]*$", re.MULTILINE)
+# A directive on its own line. The line-start check is a lookbehind after the literal
+# prefix, so the engine can search for "{{include" instead of trying every line start.
+# Files are read as bytes, so a CRLF line's "\r" is left in place after the directive.
+INCLUDE_RE = re.compile(rb"\{\{include(?<=^\{\{include)\s+(.+?)\}\}[ \t]*(?=\r?$)", re.MULTILINE)
+
+
+# (start, end, filename) of one {{include}} directive within a file's content
+Directive = tuple[int, int, str]
+
+
+def _find_includes(content: bytes) -> list[Directive]:
+    """Return every {{include}} directive in content, in order."""
+    # Most files have no directives; a substring check is far cheaper than a regex pass.
+    if b"{{include" not in content:
+        return []
+    return [(m.start(), m.end(), m.group(1).strip().decode()) for m in INCLUDE_RE.finditer(content)]
 
 
-def resolve_includes(content: str, includes_dir: Path, *, _chain: tuple[str, ...] = ()) -> str:
+def _splice(content: bytes, directives: list[Directive], fragments: dict[str, bytes]) -> bytes:
+    """Replace the given directives with already-resolved fragments, without rescanning."""
+    if not directives:
+        return content
+    parts: list[bytes] = []
+    pos = 0
+    for start, end, filename in directives:
+        parts += (content[pos:start], fragments[filename])
+        pos = end
+    parts.append(content[pos:])
+    return b"".join(parts)
+
+
+def _resolve_fragments(directives: list[Directive], includes_dir: Path, fragments: dict[str, bytes]) -> None:
+    """Resolve the included fragments and everything they include into ``fragments``.
+
+    Iterative depth-first walk: each fragment is read, scanned and expanded once,
+    after all of its own includes. The stack doubles as the chain for cycle errors.
+    """
+    stack: list[tuple[str, bytes, list[Directive], Iterator[Directive]]] = []
+    on_stack: set[str] = set()
+
+    def push(filename: str) -> None:
+        # Each fragment's path is built and read once per build; fragments are cached by
+        # name. Just read it: a separate is_file() check would stat it a second time.
+        try:
+            content = (includes_dir / filename).read_bytes()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            raise FileNotFoundError(f"include file not found: {filename}") from None
+        found = _find_includes(content)
+        stack.append((filename, content, found, iter(found)))
+        on_stack.add(filename)
+
+    for _start, _end, name in directives:
+        if name in fragments:
+            continue
+        push(name)
+        while stack:
+            filename, content, found, pending = stack[-1]
+            for _start, _end, child in pending:
+                if child in on_stack:
+                    cycle = " → ".join([*(entry[0] for entry in stack), child])
+                    raise ValueError(f"circular include detected: {cycle}")
+                if child not in fragments:
+                    push(child)
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(filename)
+                fragments[filename] = _splice(content, found, fragments)
+
+
+def resolve_includes(
+    content: bytes,
+    includes_dir: Path,
+    *,
+    fragments: dict[str, bytes] | None = None,
+) -> bytes:
     """Replace {{include <file>}} directives with fragment contents.
 
+    Works on raw UTF-8 bytes so files never need decoding.
+
+    ``fragments`` caches fully resolved fragments by filename; pass the same dict
+    across calls so each fragment is read and expanded only once.
+
     Raises on circular or missing includes.
     """
+    directives = _find_includes(content)
+    if not directives:
+        return content
+    cache = {} if fragments is None else fragments
+    _resolve_fragments(directives, includes_dir, cache)
+    return _splice(content, directives, cache)
 
-    def replacer(match: re.Match) -> str:
-        filename = match.group(1).strip()
-        if filename in _chain:
-            cycle = " → ".join([*_chain, filename])
-            raise ValueError(f"circular include detected: {cycle}")
-        fragment = includes_dir / filename
-        if not fragment.is_file():
-            raise FileNotFoundError(f"include file not found: {filename}")
-        fragment_content = fragment.read_text()
-        return resolve_includes(fragment_content, includes_dir, _chain=(*_chain, filename))
-
-    return INCLUDE_RE.sub(replacer, content)
 
+def build(briefcase_dir: Path, stdout: TextIO | None = None) -> int:
+    """Build config/ from config-src/. Returns 0 if unchanged, 1 if files were written/removed.
 
-def build(briefcase_dir: Path) -> int:
-    """Build config/ from config-src/. Returns 0 if unchanged, 1 if files were written/removed."""
+    Progress is printed to ``stdout`` (default: sys.stdout).
+    """
     src_root = briefcase_dir / CONFIG_SRC
     out_root = briefcase_dir / CONFIG_OUT
     includes_dir = src_root / INCLUDES_DIR
 
     if not src_root.is_dir():
-        print("briefcase-build: no config-src/ directory, nothing to build.")
+        print("briefcase-build: no config-src/ directory, nothing to build.", file=stdout)
         return 0
 
     # Collect source files (excluding _includes/)
     src_files: dict[str, Path] = {}
-    for path in sorted(src_root.rglob("*")):
-        if not path.is_file():
-            continue
-        rel = path.relative_to(src_root)
+    for rel_str, path in walk_files(src_root):
         # Skip anything under _includes/
-        if rel.parts[0] == INCLUDES_DIR:
+        if rel_str.partition(os.sep)[0] == INCLUDES_DIR:
             continue
-        src_files[str(rel)] = path
+        src_files[rel_str] = path
 
-    # Process each source file
+    # Resolve every source file first, so include errors abort before anything is written
     changed = False
     written_paths: set[str] = set()
+    fragments: dict[str, bytes] = {}
+    outputs: list[tuple[str, Path, bytes, str]] = []  # (rel_str, dest, content, status)
 
     for rel_str, src_path in sorted(src_files.items()):
         dest = out_root / rel_str
         written_paths.add(rel_str)
 
-        content = src_path.read_text()
-        resolved = resolve_includes(content, includes_dir)
-
-        existed = dest.is_file()
-        if existed and dest.read_text() == resolved:
-            print(f"  unchanged: {rel_str}")
-            continue
-
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_text(resolved)
-        print(f"  {'updated' if existed else 'created'}: {rel_str}")
-        changed = True
+        content = src_path.read_bytes()
+        resolved = resolve_includes(content, includes_dir, fragments=fragments)
+
+        try:
+            dest_size = dest.stat().st_size
+        except FileNotFoundError:
+            dest_size = None
+        # A size mismatch means the file changed without reading it back
+        if dest_size == len(resolved) and dest.read_bytes() == resolved:
+            status = "unchanged"
+        else:
+            status = "created" if dest_size is None else "updated"
+        outputs.append((rel_str, dest, resolved, status))
+
+    # Create each output directory once, then write files in path order
+    for parent in {dest.parent for _, dest, _, status in outputs if status != "unchanged"}:
+        parent.mkdir(parents=True, exist_ok=True)
+
+    for rel_str, dest, resolved, status in outputs:
+        if status != "unchanged":
+            dest.write_bytes(resolved)
+            changed = True
+        print(f"  {status}: {rel_str}", file=stdout)
 
     # Remove stale files from config/ that no longer have a source in config-src/
     if out_root.is_dir():
-        for path in sorted(out_root.rglob("*")):
-            if not path.is_file():
-                continue
-            rel_str = str(path.relative_to(out_root))
+        removed: list[Path] = []
+        for rel_str, path in walk_files(out_root):
             if rel_str not in written_paths:
                 path.unlink()
-                print(f"  removed: {rel_str}")
+                removed.append(path)
+                print(f"  removed: {rel_str}", file=stdout)
                 changed = True
-                # Clean up empty parent directories
-                parent = path.parent
-                while parent != out_root:
-                    try:
-                        parent.rmdir()
-                    except OSError:
-                        break
-                    parent = parent.parent
+        # Clean up empty parent directories
+        remove_empty_dirs(removed, out_root)
 
     if changed:
         return 1
@@ -100,9 +181,9 @@ def build(briefcase_dir: Path) -> int:
     # Config on disk is up-to-date. Check whether any config/ files need staging.
     unstaged = check_unstaged_config(briefcase_dir)
     if unstaged:
-        print("briefcase-build: config/ files need to be staged:")
+        print("briefcase-build: config/ files need to be staged:", file=stdout)
         for f in sorted(unstaged):
-            print(f"  unstaged: {f}")
+            print(f"  unstaged: {f}", file=stdout)
         return 1
 
     return 0
@@ -114,41 +195,42 @@ def check_unstaged_config(briefcase_dir: Path) -> list[str]:
     Returns an empty list if not inside a git repo.
     """
     try:
-        subprocess.run(
-            ["git", "rev-parse", "--git-dir"],
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "--untracked-files=all", "--", CONFIG_OUT],
             cwd=briefcase_dir,
             capture_output=True,
+            text=True,
             check=True,
         )
     except (subprocess.CalledProcessError, FileNotFoundError):
         return []
 
-    # Modified but not staged
-    result = subprocess.run(
-        ["git", "diff", "--name-only", "--", CONFIG_OUT],
-        cwd=briefcase_dir,
-        capture_output=True,
-        text=True,
-    )
-    unstaged = {f for f in result.stdout.splitlines() if f}
-
-    # Untracked files under config/
-    result = subprocess.run(
-        ["git", "ls-files", "--others", "--exclude-standard", "--", CONFIG_OUT],
-        cwd=briefcase_dir,
-        capture_output=True,
-        text=True,
-    )
-    unstaged |= {f for f in result.stdout.splitlines() if f}
+    # Each entry is "XY path" and NUL-terminated, with paths left unquoted: X is the index
+    # status, Y the work tree status. Renames and copies are followed by one more field,
+    # the original path. Anything in Y (including "??" for untracked files) is unstaged.
+    unstaged: set[str] = set()
+    fields = iter(result.stdout.split("\0"))
+    for entry in fields:
+        if not entry:
+            continue
+        status, path = entry[:2], entry[3:]
+        if status[0] in "RC":
+            next(fields, None)
+        if status[1] != " ":
+            unstaged.add(path)
 
     return sorted(unstaged)
 
 
-def main(argv: list[str] | None = None) -> int:
-    """Entry point for briefcase-build command."""
+def main(argv: list[str] | None = None, *, cwd: Path | None = None, stdout: TextIO | None = None) -> int:
+    """Entry point for briefcase-build command.
+
+    ``cwd`` and ``stdout`` default to the process's own; passing them lets callers
+    run a build without changing directory or redirecting sys.stdout.
+    """
     # Build runs in the briefcase repo itself (cwd)
-    briefcase_dir = Path.cwd()
-    return build(briefcase_dir)
+    briefcase_dir = Path.cwd() if cwd is None else cwd
+    return build(briefcase_dir, stdout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+"""agent-briefcase: file tree helpers shared by briefcase-build and briefcase-sync."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+
+def walk_files(root: Path | str, _prefix: str = "") -> Iterator[tuple[str, Path]]:
+    """Yield (relative_path, path) for every file under root, in path order.
+
+    Uses os.scandir so type checks reuse the directory listing instead of a stat
+    per entry. Symlinked files are included; symlinked directories are not followed.
+    """
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        rel = _prefix + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_files(entry.path, rel + os.sep)
+        elif entry.is_file():
+            yield rel, Path(entry.path)
+
+
+def remove_empty_dirs(removed: list[Path], root: Path) -> None:
+    """Remove directories under root left empty by removed files.
+
+    Each candidate directory is tried once, deepest first.
+    """
+    candidates: set[Path] = set()
+    for path in removed:
+        parent = path.parent
+        while parent != root and parent not in candidates:
+            candidates.add(parent)
+            parent = parent.parent
+    for d in sorted(candidates, key=lambda p: len(p.parts), reverse=True):
+        with contextlib.suppress(OSError):
+            d.rmdir()
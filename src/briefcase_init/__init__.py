@@ -3,20 +3,28 @@
 from __future__ import annotations
 
 import sys
+from functools import cache
 from importlib.metadata import version
 from pathlib import Path
+from typing import TextIO
 
 _TEMPLATES_DIR = Path(__file__).parent / "templates"
 
 
-def _load_template(name: str, **replacements: str) -> str:
-    """Load a template file, optionally substituting placeholders."""
-    content = (_TEMPLATES_DIR / name).read_text()
+@cache
+def _read_template(name: str) -> bytes:
+    return (_TEMPLATES_DIR / name).read_bytes()
+
+
+def _load_template(name: str, **replacements: str) -> bytes:
+    """Load a template file as UTF-8 bytes, optionally substituting placeholders."""
+    content = _read_template(name)
     for key, value in replacements.items():
-        content = content.replace(key, value)
+        content = content.replace(key.encode(), value.encode())
     return content
 
 
+@cache
 def _get_version() -> str:
     try:
         return "v" + version("agent-briefcase")
@@ -24,7 +32,7 @@ def _get_version() -> str:
         return "vX.Y.Z"
 
 
-def _scaffold_files(dir_name: str) -> dict[str, str]:
+def _scaffold_files(dir_name: str) -> dict[str, bytes]:
     v = _get_version()
     return {
         "BRIEFCASE.md": _load_template("BRIEFCASE.md.template", **{"$VERSION": v, "$DIR_NAME": dir_name}),
@@ -38,8 +46,23 @@ def _scaffold_files(dir_name: str) -> dict[str, str]:
 # ---------------------------------------------------------------------------
 
 
-def init(target_dir: Path) -> int:
-    """Scaffold the briefcase directory structure. Skips existing files."""
+def _write_new_file(dest: Path, content: bytes) -> bool:
+    """Create dest with content. Returns False, leaving it untouched, if it already exists."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    # "x" mode creates the file or fails if it exists, without a separate check
+    try:
+        with open(dest, "xb") as f:
+            f.write(content)
+    except FileExistsError:
+        return False
+    return True
+
+
+def init(target_dir: Path, stdout: TextIO | None = None) -> int:
+    """Scaffold the briefcase directory structure. Skips existing files.
+
+    Progress is printed to ``stdout`` (default: sys.stdout).
+    """
     dir_name = target_dir.resolve().name
     files = _scaffold_files(dir_name)
     created: list[str] = []
@@ -47,31 +70,33 @@ def init(target_dir: Path) -> int:
 
     # Ensure empty directories exist
     for dir_path in ["config", "config-src/_shared"]:
-        d = target_dir / dir_path
-        if not d.is_dir():
-            d.mkdir(parents=True, exist_ok=True)
-            print(f"  created: {dir_path}/")
-
-    for rel_path, content in sorted(files.items()):
-        dest = target_dir / rel_path
-        if dest.exists():
+        try:
+            (target_dir / dir_path).mkdir(parents=True)
+        except FileExistsError:
+            continue
+        print(f"  created: {dir_path}/", file=stdout)
+
+    for rel_path in sorted(files):
+        if not _write_new_file(target_dir / rel_path, files[rel_path]):
             skipped.append(rel_path)
-            print(f"  skipped: {rel_path} (already exists)")
+            print(f"  skipped: {rel_path} (already exists)", file=stdout)
             continue
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_text(content)
         created.append(rel_path)
-        print(f"  created: {rel_path}")
+        print(f"  created: {rel_path}", file=stdout)
 
     if not created:
-        print("briefcase-init: everything already exists, nothing to do.")
+        print("briefcase-init: everything already exists, nothing to do.", file=stdout)
 
     return 0
 
 
-def main(argv: list[str] | None = None) -> int:
-    """Entry point for briefcase-init command."""
-    return init(Path.cwd())
+def main(argv: list[str] | None = None, *, cwd: Path | None = None, stdout: TextIO | None = None) -> int:
+    """Entry point for briefcase-init command.
+
+    ``cwd`` and ``stdout`` default to the process's own; passing them lets callers
+    scaffold a directory without changing into it or redirecting sys.stdout.
+    """
+    return init(Path.cwd() if cwd is None else cwd, stdout)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,12 @@ import os
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
+from typing import TextIO
+
+from briefcase_files import remove_empty_dirs, walk_files
 
 LOCK_FILE = ".briefcase.lock"
 POST_SYNC_HOOK = ".briefcase-post-sync.sh"
@@ -20,22 +25,38 @@ CONFIG_DIR = "config"
 DEFAULT_SHARED_FOLDER = "_shared"
 
 
+HASH_CHUNK_SIZE = 64 * 1024
+
+
 def hash_file(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+        return h.hexdigest()
 
 
 def read_lock(path: Path) -> dict:
     if not path.exists():
         return {"source_commit": "", "files": {}}
-    with open(path) as f:
-        return json.load(f)
+    return json.loads(path.read_bytes())
 
 
 def write_lock(path: Path, source_commit: str, files: dict[str, dict]) -> None:
     data = {"source_commit": source_commit, "files": files}
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, sort_keys=True)
-        f.write("\n")
+    payload = (json.dumps(data, indent=2, sort_keys=True) + "\n").encode()
+    if path.exists() and path.read_bytes() == payload:
+        return  # unchanged: skip the write and rename
+    # Write to a sibling temp file and rename, so a crash never leaves a truncated lock
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
+
+# Whether each briefcase dir is a git repo, as learned by get_briefcase_commit
+_git_repos: dict[Path, bool] = {}
 
 
 def get_briefcase_commit(briefcase_dir: Path) -> str:
@@ -46,17 +67,21 @@ def get_briefcase_commit(briefcase_dir: Path) -> str:
             text=True,
             check=True,
         )
-        return result.stdout.strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
+        _git_repos[briefcase_dir] = False
         return "unknown"
+    _git_repos[briefcase_dir] = True
+    return result.stdout.strip()
 
 
-def check_briefcase_staleness(briefcase_dir: Path) -> None:
+def check_briefcase_staleness(briefcase_dir: Path, stderr: TextIO | None = None) -> None:
     """Fetch the briefcase remote and warn if local HEAD is behind.
 
     This is purely informational — it never modifies the working tree.
     Failures (offline, not a git repo, no remote) are silently ignored.
     """
+    if not _git_repos.get(briefcase_dir, True):
+        return  # known not to be a git repo: don't spawn a fetch that will fail
     git = ["git", "-C", str(briefcase_dir)]
     try:
         # Fetch remote tracking refs (non-destructive)
@@ -66,18 +91,12 @@ def check_briefcase_staleness(briefcase_dir: Path) -> None:
             check=True,
             timeout=10,
         )
-        # Get local HEAD
-        local = subprocess.run(
-            [*git, "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=True,
-        ).stdout.strip()
-        # Get the default remote branch (try origin/main, then origin/master)
+        # Count how many commits we're behind the default remote branch
+        # (try origin/main, then origin/master). rev-list fails if the ref is missing.
         for branch in ("origin/main", "origin/master"):
             try:
-                remote = subprocess.run(
-                    [*git, "rev-parse", branch],
+                behind = subprocess.run(
+                    [*git, "rev-list", "--count", f"HEAD..{branch}"],
                     capture_output=True,
                     text=True,
                     check=True,
@@ -88,24 +107,13 @@ def check_briefcase_staleness(briefcase_dir: Path) -> None:
         else:
             return  # no known remote branch found
 
-        if local == remote:
-            return
-
-        # Count how many commits we're behind
-        behind = subprocess.run(
-            [*git, "rev-list", "--count", f"{local}..{remote}"],
-            capture_output=True,
-            text=True,
-            check=True,
-        ).stdout.strip()
-
         if behind == "0":
             return
 
         print(
             f"briefcase: WARNING — briefcase repo is {behind} commit(s) behind {branch}. "
             f"Run `git -C {briefcase_dir} pull` to get the latest team config.",
-            file=sys.stderr,
+            file=stderr,
         )
     except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError, OSError):
         pass
@@ -121,114 +129,124 @@ def collect_files(briefcase_dir: Path, project_name: str, shared_folder: str) ->
 
     config_root = briefcase_dir / CONFIG_DIR
 
-    shared_dir = config_root / shared_folder
-    if shared_dir.is_dir():
-        for src in sorted(shared_dir.rglob("*")):
-            if src.is_file():
-                rel = str(src.relative_to(shared_dir))
-                files[rel] = src
-
+    # Walk the project first so overridden shared files are never inserted
     project_dir = config_root / project_name
     if project_dir.is_dir():
-        for src in sorted(project_dir.rglob("*")):
-            if src.is_file():
-                rel = str(src.relative_to(project_dir))
-                files[rel] = src
+        for rel, src in walk_files(project_dir):
+            files[rel] = src
+
+    shared_dir = config_root / shared_folder
+    if shared_dir.is_dir():
+        for rel, src in walk_files(shared_dir):
+            files.setdefault(rel, src)
 
     return files
 
 
+def _sync_one(
+    project_dir: Path, dest_rel: str, src_path: Path, old_files: dict, briefcase_dir: Path
+) -> tuple[dict, str]:
+    """Sync a single file. Returns its lock entry and the message to print."""
+    dest = project_dir / dest_rel
+    source_rel = str(src_path.relative_to(briefcase_dir))
+    synced_hash = None  # hash of dest when it is still exactly what we last synced
+
+    if dest_rel in old_files and dest.exists():
+        current_hash = hash_file(dest)
+        if current_hash != old_files[dest_rel].get("sha256", ""):
+            entry = {"sha256": current_hash, "source": source_rel}
+            return entry, f"briefcase: SKIPPING {dest_rel} (locally modified)"
+        synced_hash = current_hash
+
+    new_hash = hash_file(src_path)
+    # Source, lock and dest all agree (the steady state): nothing to copy
+    if new_hash != synced_hash:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src_path, dest)
+    elif src_path.stat().st_mode != dest.stat().st_mode:
+        # Same content, but copy2 would still have carried over a changed mode (e.g. +x)
+        shutil.copystat(src_path, dest)
+    return {"sha256": new_hash, "source": source_rel}, f"briefcase: synced {dest_rel}"
+
+
 def sync_files(
+    project_dir: Path,
     files_to_sync: dict[str, Path],
     old_lock: dict,
     briefcase_dir: Path,
+    stdout: TextIO | None = None,
 ) -> dict[str, dict]:
-    """Sync files, skipping locally modified ones. Returns new file entries for lock."""
+    """Sync files, skipping locally modified ones. Returns new file entries for lock.
+
+    Files are hashed and copied concurrently; messages are printed in path order.
+    """
     old_files = old_lock.get("files", {})
     new_files: dict[str, dict] = {}
 
-    for dest_rel, src_path in sorted(files_to_sync.items()):
-        dest = Path(dest_rel)
-        source_rel = str(src_path.relative_to(briefcase_dir))
-        new_hash = hash_file(src_path)
-
-        if dest.exists():
-            current_hash = hash_file(dest)
-            if dest_rel in old_files:
-                locked_hash = old_files[dest_rel].get("sha256", "")
-                if current_hash != locked_hash:
-                    print(f"briefcase: SKIPPING {dest_rel} (locally modified)")
-                    new_files[dest_rel] = {
-                        "sha256": current_hash,
-                        "source": source_rel,
-                    }
-                    continue
-
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src_path, dest)
-        new_files[dest_rel] = {"sha256": new_hash, "source": source_rel}
-        print(f"briefcase: synced {dest_rel}")
+    dest_rels = sorted(files_to_sync)
+    with ThreadPoolExecutor() as executor:
+        results = executor.map(
+            lambda dest_rel: _sync_one(project_dir, dest_rel, files_to_sync[dest_rel], old_files, briefcase_dir),
+            dest_rels,
+        )
+        for dest_rel, (entry, message) in zip(dest_rels, results, strict=True):
+            new_files[dest_rel] = entry
+            print(message, file=stdout)
 
     return new_files
 
 
-def cleanup_removed(old_lock: dict, new_managed_files: dict[str, dict]) -> None:
+def cleanup_removed(
+    project_dir: Path, old_lock: dict, new_managed_files: dict[str, dict], stdout: TextIO | None = None
+) -> None:
     old_files = old_lock.get("files", {})
+    removed: list[Path] = []
     for file_path in old_files:
         if file_path not in new_managed_files:
-            p = Path(file_path)
+            p = project_dir / file_path
             if p.exists():
                 p.unlink()
-                print(f"briefcase: removed {file_path} (no longer in briefcase)")
-            # Clean up empty parent directories
-            parent = p.parent
-            while parent != Path("."):
-                try:
-                    parent.rmdir()
-                except OSError:
-                    break
-                parent = parent.parent
-
-
-def update_gitignore(managed_files: dict[str, dict]) -> None:
-    gitignore = Path(".gitignore")
-    lines: list[str] = []
-    if gitignore.exists():
-        lines = gitignore.read_text().splitlines()
+                print(f"briefcase: removed {file_path} (no longer in briefcase)", file=stdout)
+            removed.append(p)
+    # Clean up empty parent directories
+    remove_empty_dirs(removed, project_dir)
+
+
+def update_gitignore(project_dir: Path, managed_files: dict[str, dict]) -> None:
+    gitignore = project_dir / ".gitignore"
+    text = gitignore.read_bytes().decode("utf-8") if gitignore.exists() else ""
 
     # Build the managed section
-    managed_section = [MARKER_BEGIN]
-    for file_path in sorted(managed_files):
-        managed_section.append(f"/{file_path}")
-    managed_section.append(MARKER_END)
-
-    # Find existing markers
-    begin_idx = None
-    end_idx = None
-    for i, line in enumerate(lines):
-        if line == MARKER_BEGIN:
-            begin_idx = i
-        elif line == MARKER_END:
-            end_idx = i
-
-    if begin_idx is not None and end_idx is not None:
-        lines[begin_idx : end_idx + 1] = managed_section
+    managed_section = "\n".join([MARKER_BEGIN, *(f"/{file_path}" for file_path in sorted(managed_files)), MARKER_END])
+
+    # Find existing markers and splice the section in place
+    begin = text.find(MARKER_BEGIN)
+    end = text.find(MARKER_END, begin) if begin != -1 else -1
+
+    if end != -1:
+        text = text[:begin] + managed_section + text[end + len(MARKER_END) :]
     else:
-        if lines and lines[-1] != "":
-            lines.append("")
-        lines.extend(managed_section)
+        if text and not text.endswith("\n"):
+            text += "\n"
+        if text and not text.endswith("\n\n"):
+            text += "\n"
+        text += managed_section
 
-    gitignore.write_text("\n".join(lines) + "\n")
+    if not text.endswith("\n"):
+        text += "\n"
+    gitignore.write_bytes(text.encode("utf-8"))
 
 
-def run_post_sync_hook() -> None:
-    hook = Path(POST_SYNC_HOOK)
+def run_post_sync_hook(project_dir: Path, stdout: TextIO | None = None) -> None:
+    hook = project_dir / POST_SYNC_HOOK
     if hook.exists() and os.access(hook, os.X_OK):
-        print(f"briefcase: running {POST_SYNC_HOOK}")
-        subprocess.run(["bash", str(hook)], check=False)
+        print(f"briefcase: running {POST_SYNC_HOOK}", file=stdout)
+        subprocess.run(["bash", POST_SYNC_HOOK], cwd=project_dir, check=False)
 
 
-def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+@cache
+def _parser() -> argparse.ArgumentParser:
+    # Built once per process: main() may run many times in-process (e.g. under tests)
     parser = argparse.ArgumentParser(description="Sync AI agent config from a briefcase repo.")
     parser.add_argument(
         "--briefcase",
@@ -248,68 +266,84 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=DEFAULT_SHARED_FOLDER,
         help=f"Shared folder name inside the briefcase (default: '{DEFAULT_SHARED_FOLDER}').",
     )
-    return parser.parse_args(argv)
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    return _parser().parse_args(argv)
+
 
+def main(
+    argv: list[str] | None = None,
+    *,
+    cwd: Path | None = None,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int:
+    """Entry point for briefcase-sync command.
 
-def main(argv: list[str] | None = None) -> int:
+    ``cwd``, ``stdout`` and ``stderr`` default to the process's own; passing them
+    lets callers sync a project without changing directory or redirecting sys.std*.
+    """
     args = parse_args(argv)
 
-    project_dir = Path.cwd()
+    project_dir = Path.cwd() if cwd is None else cwd.resolve()
     project_name = args.project or project_dir.name
 
+    # Relative briefcase paths are relative to the project, wherever that is
     env_briefcase = os.environ.get("BRIEFCASE_PATH")
     if env_briefcase:
-        briefcase_dir = Path(env_briefcase).resolve()
+        briefcase_dir = (project_dir / env_briefcase).resolve()
     elif args.briefcase:
-        briefcase_dir = Path(args.briefcase).resolve()
+        briefcase_dir = (project_dir / args.briefcase).resolve()
     else:
         briefcase_dir = project_dir.parent / DEFAULT_BRIEFCASE_DIR_NAME
 
     if not briefcase_dir.is_dir():
         print(
             f"briefcase: WARNING — briefcase repo not found at '{briefcase_dir}', skipping sync.",
-            file=sys.stderr,
+            file=stderr,
         )
         return 0
 
+    # Get briefcase commit (this also tells us whether it is a git repo)
+    source_commit = get_briefcase_commit(briefcase_dir)
+
     # Check if briefcase is behind remote
-    check_briefcase_staleness(briefcase_dir)
+    check_briefcase_staleness(briefcase_dir, stderr)
 
     # Read current lock
-    lock_path = Path(LOCK_FILE)
+    lock_path = project_dir / LOCK_FILE
     old_lock = read_lock(lock_path)
 
-    # Get briefcase commit
-    source_commit = get_briefcase_commit(briefcase_dir)
-
     # Collect files with layering
     files_to_sync = collect_files(briefcase_dir, project_name, args.shared)
 
     if not files_to_sync:
         print(
             f"briefcase: WARNING — no files found in briefcase for project '{project_name}', skipping sync.",
-            file=sys.stderr,
+            file=stderr,
         )
-        cleanup_removed(old_lock, {})
-        update_gitignore({})
+        cleanup_removed(project_dir, old_lock, {}, stdout)
+        update_gitignore(project_dir, {})
         write_lock(lock_path, source_commit, {})
         return 0
 
     # Sync files
-    new_files = sync_files(files_to_sync, old_lock, briefcase_dir)
+    new_files = sync_files(project_dir, files_to_sync, old_lock, briefcase_dir, stdout)
 
     # Clean up removed files
-    cleanup_removed(old_lock, new_files)
+    cleanup_removed(project_dir, old_lock, new_files, stdout)
 
     # Update .gitignore
-    update_gitignore(new_files)
+    update_gitignore(project_dir, new_files)
 
     # Write lock file
     write_lock(lock_path, source_commit, new_files)
-    print(f"briefcase: updated {LOCK_FILE} (remember to commit it)")
+    print(f"briefcase: updated {LOCK_FILE} (remember to commit it)", file=stdout)
 
     # Run post-sync hook
-    run_post_sync_hook()
+    run_post_sync_hook(project_dir, stdout)
 
     return 0
 
@@ -1,23 +1,29 @@
 """Pytest configuration for build e2e tests.
 
-Routes approved/received files to the approved_files/ subdirectory
-and generates SCENARIOS-build.md after each test run.
+Provides the briefcase fixtures. SCENARIOS-build.md is generated by
+tests/conftest.py.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
 
-from tests.scenario_report import generate_report
+import pytest
 
-SUITE_DIR = Path(__file__).parent
-APPROVED_DIR = SUITE_DIR / "approved_files"
-SCENARIOS_MD = SUITE_DIR.parents[1] / "SCENARIOS-build.md"
+from tests.scenario_helpers import copy_template
 
 
-def pytest_sessionfinish(session, exitstatus):
-    generate_report(
-        title="Briefcase-Build Scenarios",
-        approved_dir=APPROVED_DIR,
-        output_path=SCENARIOS_MD,
-    )
+@pytest.fixture(scope="session")
+def skeleton(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A minimal briefcase (config-src/_shared/CLAUDE.md only), written once per session."""
+    skeleton_dir = tmp_path_factory.mktemp("skeleton") / "briefcase"
+    rules = skeleton_dir / "config-src" / "_shared" / "CLAUDE.md"
+    rules.parent.mkdir(parents=True)
+    rules.write_text("# rules")
+    return skeleton_dir
+
+
+@pytest.fixture
+def briefcase(skeleton: Path, tmp_path: Path) -> Path:
+    """A private copy of the skeleton briefcase for one test to modify."""
+    return copy_template(skeleton, tmp_path / "briefcase")
@@ -4,15 +4,14 @@ from __future__ import annotations
 
 import os
 import subprocess
-import textwrap
+from contextlib import redirect_stderr
 from io import StringIO
 from pathlib import Path
-from unittest.mock import patch
 
 from approvaltests import verify
-from approvaltests.storyboard import Storyboard
 
 import briefcase_build
+from tests.scenario_helpers import add_result, file_tree, read_file, scenario, write_file
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -20,64 +19,19 @@ import briefcase_build
 
 
 def run_build(briefcase_dir: Path) -> tuple[int, str, str]:
-    """Run briefcase_build.build() inside briefcase_dir, capturing stdout/stderr."""
+    """Run briefcase_build.main() against briefcase_dir, capturing stdout/stderr."""
     stdout, stderr = StringIO(), StringIO()
-    original_cwd = os.getcwd()
-    try:
-        os.chdir(briefcase_dir)
-        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
-            exit_code = briefcase_build.main()
-    finally:
-        os.chdir(original_cwd)
-
+    with redirect_stderr(stderr):
+        exit_code = briefcase_build.main(cwd=briefcase_dir, stdout=stdout)
     return exit_code, stdout.getvalue(), stderr.getvalue()
 
 
-def write_file(path: Path, content: str = "") -> None:
-    """Create a file with content, making parent dirs as needed."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content)
-
-
 def config_tree(briefcase_dir: Path) -> str:
     """Tree of config/ output files."""
     config_dir = briefcase_dir / "config"
     if not config_dir.is_dir():
         return "(no config/ directory)"
-    lines = []
-    for entry in sorted(config_dir.rglob("*")):
-        if entry.is_file():
-            rel = entry.relative_to(config_dir)
-            lines.append(str(rel))
-    return "\n".join(lines) if lines else "(empty)"
-
-
-def read_file(path: Path) -> str:
-    """Read a file's content."""
-    if not path.exists():
-        return "(file does not exist)"
-    return path.read_text()
-
-
-def format_output(text: str) -> str:
-    """Format captured output for the storyboard."""
-    if not text.strip():
-        return "(empty)"
-    return textwrap.indent(text.rstrip(), "  ")
-
-
-def scenario(description: str) -> Storyboard:
-    """Start a new storyboard with a scenario description."""
-    story = Storyboard()
-    story.add_description(f"Scenario: {description}")
-    return story
-
-
-def add_result(story: Storyboard, exit_code: int, stdout: str, stderr: str) -> None:
-    """Add the standard result frames to a storyboard."""
-    story.add_frame(format_output(stdout), "stdout")
-    story.add_frame(format_output(stderr), "stderr")
-    story.add_frame(exit_code, "exit code")
+    return file_tree(config_dir)
 
 
 # ---------------------------------------------------------------------------
@@ -138,6 +92,24 @@ class TestIncludeExpansion_2:
         )
         verify(story)
 
+    def test_2_include_in_crlf_source(self, tmp_path: Path) -> None:
+        briefcase = tmp_path / "briefcase"
+        write_file(briefcase / "config-src" / "_includes" / "debug.md", "## Debug")
+        source = briefcase / "config-src" / "_shared" / "CLAUDE.md"
+        source.parent.mkdir(parents=True)
+        source.write_bytes(b"# Rules\r\n{{include debug.md}}\r\nDone.\r\n")
+
+        exit_code, stdout, stderr = run_build(briefcase)
+
+        story = scenario("Include directives are expanded in files with CRLF line endings")
+        story.add_frame(repr(source.read_bytes()), "config-src/_shared/CLAUDE.md (source)")
+        add_result(story, exit_code, stdout, stderr)
+        story.add_frame(
+            repr((briefcase / "config" / "_shared" / "CLAUDE.md").read_bytes()),
+            "config/_shared/CLAUDE.md (built)",
+        )
+        verify(story)
+
 
 class TestNestedIncludes_3:
     def test_1_nested_includes_are_resolved(self, tmp_path: Path) -> None:
@@ -182,6 +154,27 @@ class TestCircularIncludeDetection_4:
         story.add_frame(error, "Error")
         verify(story)
 
+    def test_2_cycle_below_the_first_fragment_reports_full_chain(self, tmp_path: Path) -> None:
+        briefcase = tmp_path / "briefcase"
+        write_file(briefcase / "config-src" / "_includes" / "a.md", "{{include b.md}}")
+        write_file(briefcase / "config-src" / "_includes" / "b.md", "{{include c.md}}")
+        write_file(briefcase / "config-src" / "_includes" / "c.md", "{{include b.md}}")
+        write_file(
+            briefcase / "config-src" / "_shared" / "CLAUDE.md",
+            "{{include a.md}}",
+        )
+
+        try:
+            run_build(briefcase)
+            error = "(no error raised)"
+        except ValueError as e:
+            error = str(e)
+
+        story = scenario("A cycle deeper in the include chain is reported with the full path that reached it")
+        story.add_frame("CLAUDE.md → a.md → b.md → c.md → b.md (cycle!)", "Include chain")
+        story.add_frame(error, "Error")
+        verify(story)
+
 
 class TestMissingInclude_5:
     def test_1_missing_include_produces_error(self, tmp_path: Path) -> None:
@@ -220,9 +213,7 @@ class TestIncludesDirNotCopied_6:
 
 
 class TestStaleFileCleanup_7:
-    def test_1_removed_source_is_removed_from_config(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config-src" / "_shared" / "CLAUDE.md", "# rules")
+    def test_1_removed_source_is_removed_from_config(self, briefcase: Path) -> None:
         write_file(briefcase / "config-src" / "_shared" / "extra.md", "# extra")
 
         run_build(briefcase)
@@ -242,10 +233,7 @@ class TestStaleFileCleanup_7:
 
 
 class TestNoOpWhenUpToDate_8:
-    def test_1_no_changes_exits_zero(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config-src" / "_shared" / "CLAUDE.md", "# rules")
-
+    def test_1_no_changes_exits_zero(self, briefcase: Path) -> None:
         run_build(briefcase)
         exit_code, stdout, stderr = run_build(briefcase)
 
@@ -253,12 +241,21 @@ class TestNoOpWhenUpToDate_8:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
+    def test_2_unchanged_output_is_not_rewritten(self, briefcase: Path) -> None:
+        run_build(briefcase)
+        built = briefcase / "config" / "_shared" / "CLAUDE.md"
+        # Backdate the output so any rewrite would show up as a new mtime
+        os.utime(built, ns=(0, 0))
+        exit_code, stdout, stderr = run_build(briefcase)
+
+        story = scenario("Re-running build leaves byte-identical outputs untouched on disk")
+        add_result(story, exit_code, stdout, stderr)
+        story.add_frame(built.stat().st_mtime_ns != 0, "config/_shared/CLAUDE.md rewritten?")
+        verify(story)
 
-class TestFilesChangedExitsOne_9:
-    def test_1_changes_exit_one(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config-src" / "_shared" / "CLAUDE.md", "# rules")
 
+class TestFilesChangedExitsOne_9:
+    def test_1_changes_exit_one(self, briefcase: Path) -> None:
         exit_code, stdout, stderr = run_build(briefcase)
 
         story = scenario("Build that writes files exits 1 (files changed)")
@@ -355,3 +352,51 @@ class TestUnstagedConfigDetection_11:
             "Expected behavior",
         )
         verify(story)
+
+    def test_2_unstaged_path_with_spaces(self, tmp_path: Path) -> None:
+        briefcase = tmp_path / "briefcase"
+        briefcase.mkdir()
+        init_git_repo(briefcase)
+
+        write_file(briefcase / "config-src" / "_shared" / "my notes.md", "# notes")
+        run_build(briefcase)
+        git(briefcase, "add", "config-src")
+
+        exit_code, stdout, stderr = run_build(briefcase)
+
+        story = scenario("Unstaged config/ paths containing spaces are reported unquoted")
+        story.add_frame("config/_shared/my notes.md is NOT staged", "Git staging state")
+        add_result(story, exit_code, stdout, stderr)
+        verify(story)
+
+
+class TestSharedFragments_12:
+    def test_1_fragment_shared_by_several_sources(self, tmp_path: Path) -> None:
+        briefcase = tmp_path / "briefcase"
+        write_file(briefcase / "config-src" / "_includes" / "inner.md", "inner content")
+        write_file(briefcase / "config-src" / "_includes" / "common.md", "## Common\n{{include inner.md}}")
+        write_file(briefcase / "config-src" / "_shared" / "CLAUDE.md", "# Shared\n{{include common.md}}")
+        write_file(
+            briefcase / "config-src" / "projectA" / "AGENTS.md",
+            "# projectA\n{{include common.md}}\n{{include inner.md}}",
+        )
+
+        exit_code, stdout, stderr = run_build(briefcase)
+
+        story = scenario("A fragment included from several sources is expanded identically everywhere")
+        story.add_frame(
+            "common.md includes inner.md\n"
+            "_shared/CLAUDE.md includes common.md\n"
+            "projectA/AGENTS.md includes common.md and inner.md",
+            "Include graph",
+        )
+        add_result(story, exit_code, stdout, stderr)
+        story.add_frame(
+            read_file(briefcase / "config" / "_shared" / "CLAUDE.md"),
+            "config/_shared/CLAUDE.md (built)",
+        )
+        story.add_frame(
+            read_file(briefcase / "config" / "projectA" / "AGENTS.md"),
+            "config/projectA/AGENTS.md (built)",
+        )
+        verify(story)
@@ -0,0 +1,35 @@
+"""Pytest configuration shared by all suites.
+
+Generates the SCENARIOS-*.md files from each suite's approved test output
+after each test run. This lives here rather than in the suite conftests so
+that it also runs on the pytest-xdist controller, which only loads conftests
+down to the directories it was given.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from tests.scenario_report import generate_report
+
+TESTS_DIR = Path(__file__).parent
+
+# (suite directory, report title, output file)
+REPORTS = [
+    ("build_cmd", "Briefcase-Build Scenarios", "SCENARIOS-build.md"),
+    ("init_cmd", "Briefcase-Init Scenarios", "SCENARIOS-init.md"),
+    ("sync", "Briefcase-Sync Scenarios", "SCENARIOS-sync.md"),
+]
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Under pytest-xdist every worker finishes a session too; only the controller,
+    # which has no workerinput, writes the reports.
+    if hasattr(session.config, "workerinput"):
+        return
+    for suite, title, filename in REPORTS:
+        generate_report(
+            title=title,
+            approved_dir=TESTS_DIR / suite / "approved_files",
+            output_path=TESTS_DIR.parent / filename,
+        )
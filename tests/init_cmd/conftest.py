@@ -1,23 +1,23 @@
 """Pytest configuration for init e2e tests.
 
-Routes approved/received files to the approved_files/ subdirectory
-and generates SCENARIOS-init.md after each test run.
+Provides the initialized_briefcase fixture. SCENARIOS-init.md is generated by
+tests/conftest.py.
 """
 
 from __future__ import annotations
 
+from io import StringIO
 from pathlib import Path
 
-from tests.scenario_report import generate_report
+import pytest
 
-SUITE_DIR = Path(__file__).parent
-APPROVED_DIR = SUITE_DIR / "approved_files"
-SCENARIOS_MD = SUITE_DIR.parents[1] / "SCENARIOS-init.md"
+import briefcase_init
 
 
-def pytest_sessionfinish(session, exitstatus):
-    generate_report(
-        title="Briefcase-Init Scenarios",
-        approved_dir=APPROVED_DIR,
-        output_path=SCENARIOS_MD,
-    )
+@pytest.fixture(scope="class")
+def initialized_briefcase(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A briefcase scaffolded once per class, for tests that only read what init generated."""
+    target = tmp_path_factory.mktemp("init") / "briefcase"
+    target.mkdir()
+    briefcase_init.main(cwd=target, stdout=StringIO())
+    return target
@@ -2,17 +2,15 @@
 
 from __future__ import annotations
 
-import os
 import re
-import textwrap
+from contextlib import redirect_stderr
 from io import StringIO
 from pathlib import Path
-from unittest.mock import patch
 
 from approvaltests import verify
-from approvaltests.storyboard import Storyboard
 
 import briefcase_init
+from tests.scenario_helpers import add_result, file_tree, read_file, scenario
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -23,62 +21,18 @@ VERSION_PLACEHOLDER = r"\1v<VERSION>"
 
 
 def run_init(target_dir: Path) -> tuple[int, str, str]:
-    """Run briefcase_init.main() inside target_dir, capturing stdout/stderr."""
+    """Run briefcase_init.main() against target_dir, capturing stdout/stderr."""
     stdout, stderr = StringIO(), StringIO()
-    original_cwd = os.getcwd()
-    try:
-        os.chdir(target_dir)
-        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
-            exit_code = briefcase_init.main()
-    finally:
-        os.chdir(original_cwd)
-
+    with redirect_stderr(stderr):
+        exit_code = briefcase_init.main(cwd=target_dir, stdout=stdout)
     return exit_code, stdout.getvalue(), stderr.getvalue()
 
 
-def dir_tree(root: Path) -> str:
-    """Tree of all files under root, relative paths."""
-    lines = []
-    for entry in sorted(root.rglob("*")):
-        if entry.is_file():
-            rel = entry.relative_to(root)
-            lines.append(str(rel))
-    return "\n".join(lines) if lines else "(empty)"
-
-
-def read_file(path: Path) -> str:
-    """Read a file's content."""
-    if not path.exists():
-        return "(file does not exist)"
-    return path.read_text()
-
-
 def scrub_version(text: str) -> str:
     """Replace concrete version strings so approved files don't go stale."""
     return VERSION_RE.sub(VERSION_PLACEHOLDER, text)
 
 
-def format_output(text: str) -> str:
-    """Format captured output for the storyboard."""
-    if not text.strip():
-        return "(empty)"
-    return textwrap.indent(text.rstrip(), "  ")
-
-
-def scenario(description: str) -> Storyboard:
-    """Start a new storyboard with a scenario description."""
-    story = Storyboard()
-    story.add_description(f"Scenario: {description}")
-    return story
-
-
-def add_result(story: Storyboard, exit_code: int, stdout: str, stderr: str) -> None:
-    """Add the standard result frames to a storyboard."""
-    story.add_frame(format_output(stdout), "stdout")
-    story.add_frame(format_output(stderr), "stderr")
-    story.add_frame(exit_code, "exit code")
-
-
 # ---------------------------------------------------------------------------
 # Scenarios
 # ---------------------------------------------------------------------------
@@ -93,7 +47,7 @@ class TestScaffoldEmptyDir_1:
 
         story = scenario("Init in an empty directory creates the full briefcase structure")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(dir_tree(target), "directory tree after init")
+        story.add_frame(file_tree(target), "directory tree after init")
         story.add_frame(
             read_file(target / "BRIEFCASE.md") != "(file does not exist)",
             "BRIEFCASE.md exists",
@@ -147,7 +101,7 @@ class TestPartialExisting_3:
         story = scenario("Init with partially existing structure creates missing parts, skips existing")
         story.add_frame("config-src/_includes/README.md already exists with custom content", "Setup")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(dir_tree(target), "directory tree after init")
+        story.add_frame(file_tree(target), "directory tree after init")
         story.add_frame(
             read_file(target / "config-src" / "_includes" / "README.md"),
             "config-src/_includes/README.md (preserved)",
@@ -156,21 +110,15 @@ class TestPartialExisting_3:
 
 
 class TestGeneratedContent_4:
-    def test_1_briefcase_md_content(self, tmp_path: Path) -> None:
-        target = tmp_path / "briefcase"
-        target.mkdir()
-
-        run_init(target)
+    def test_1_briefcase_md_content(self, initialized_briefcase: Path) -> None:
+        target = initialized_briefcase
 
         story = scenario("BRIEFCASE.md contains operational guide for the team")
         story.add_frame(scrub_version(read_file(target / "BRIEFCASE.md")), "BRIEFCASE.md")
         verify(story)
 
-    def test_2_includes_readme_content(self, tmp_path: Path) -> None:
-        target = tmp_path / "briefcase"
-        target.mkdir()
-
-        run_init(target)
+    def test_2_includes_readme_content(self, initialized_briefcase: Path) -> None:
+        target = initialized_briefcase
 
         story = scenario("config-src/_includes/README.md explains the _includes directory")
         story.add_frame(
@@ -179,11 +127,8 @@ class TestGeneratedContent_4:
         )
         verify(story)
 
-    def test_3_dotfiles_readme_content(self, tmp_path: Path) -> None:
-        target = tmp_path / "briefcase"
-        target.mkdir()
-
-        run_init(target)
+    def test_3_dotfiles_readme_content(self, initialized_briefcase: Path) -> None:
+        target = initialized_briefcase
 
         story = scenario("dotfiles/README.md explains the dotfiles directory")
         story.add_frame(
@@ -0,0 +1,77 @@
+"""Helpers shared by the build, init and sync scenario suites."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+from approvaltests.storyboard import Storyboard
+
+
+def write_file(path: Path, content: str = "") -> None:
+    """Create a file with content, making parent dirs as needed."""
+    # Only create the parents when the write shows they are missing
+    try:
+        path.write_text(content)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True)
+        path.write_text(content)
+
+
+def write_files(root: Path, files: dict[str, str]) -> None:
+    """Create several files under root, making each parent dir once."""
+    for parent in {(root / rel).parent for rel in files}:
+        parent.mkdir(parents=True, exist_ok=True)
+    for rel, content in files.items():
+        (root / rel).write_text(content)
+
+
+def read_file(path: Path) -> str:
+    """Read a file's content."""
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        return "(file does not exist)"
+
+
+def file_tree(root: Path) -> str:
+    """Tree of all files under root, relative paths."""
+    # Plain strings throughout: no Path object or relative_to() per entry
+    base = str(root)
+    prefix_len = len(base) + len(os.sep)
+    lines = []
+    for dirpath, _dirs, files in os.walk(base):
+        for name in files:
+            lines.append(os.path.join(dirpath, name)[prefix_len:])
+    lines.sort()
+    return "\n".join(lines) if lines else "(empty)"
+
+
+def copy_template(template: Path, dest: Path) -> Path:
+    """Give one test a private copy of a session-scoped template tree."""
+    # Copied rather than hard-linked: scenarios rewrite and delete files in place.
+    return Path(shutil.copytree(template, dest))
+
+
+def format_output(text: str) -> str:
+    """Format captured output for the storyboard."""
+    text = text.rstrip()
+    if not text:
+        return "(empty)"
+    # Same result as textwrap.indent(text, "  "): blank lines stay unindented.
+    return "\n".join(f"  {line}" if line.strip() else line for line in text.split("\n"))
+
+
+def scenario(description: str) -> Storyboard:
+    """Start a new storyboard with a scenario description."""
+    story = Storyboard()
+    story.add_description(f"Scenario: {description}")
+    return story
+
+
+def add_result(story: Storyboard, exit_code: int, stdout: str, stderr: str) -> None:
+    """Add the standard result frames to a storyboard."""
+    story.add_frame(format_output(stdout), "stdout")
+    story.add_frame(format_output(stderr), "stderr")
+    story.add_frame(exit_code, "exit code")
@@ -11,87 +11,116 @@ Conventions:
 
 from __future__ import annotations
 
+import contextlib
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 AUTOGEN_HEADER = (
     "> **Auto-generated** from approved test output — do not edit by hand.\n> Re-run `pytest` to regenerate.\n"
 )
 
+_TEST_PREFIX_RE = re.compile(r"test_(\d+)_")
+_CLASS_AFFIXES_RE = re.compile(r"^Test|_\d+$")
+_CAMEL_SPLIT_RE = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_CLASS_SUFFIX_RE = re.compile(r"_(\d+)$")
+_TEST_TITLE_RE = re.compile(r"^test_\d+_")
+_BACKTICK_RUN_RE = re.compile(rb"`+")
+
 
 def _test_sort_key(test_name: str) -> int:
-    match = re.match(r"test_(\d+)_", test_name)
+    match = _TEST_PREFIX_RE.match(test_name)
     return int(match.group(1)) if match else 999
 
 
 def _parse_approved_filename(filename: str) -> tuple[str | None, str]:
-    stem = filename.replace(".approved.txt", "")
-    parts = stem.split(".", 1)
-    if len(parts) == 2 and not parts[0].startswith("test_"):
-        return parts[0], parts[1]
+    stem = filename.removesuffix(".approved.txt")
+    class_name, sep, test_name = stem.partition(".")
+    if sep and not class_name.startswith("test_"):
+        return class_name, test_name
     return None, stem
 
 
 def _class_to_section(class_name: str | None) -> str:
     if not class_name:
         return "Other"
-    stripped = re.sub(r"^Test|_\d+$", "", class_name)
-    spaced = re.sub(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", " ", stripped)
+    stripped = _CLASS_AFFIXES_RE.sub("", class_name)
+    spaced = _CAMEL_SPLIT_RE.sub(" ", stripped)
     return spaced.replace(" And ", " & ")
 
 
 def _class_sort_key(class_name: str | None) -> int:
     if not class_name:
         return 999
-    match = re.search(r"_(\d+)$", class_name)
+    match = _CLASS_SUFFIX_RE.search(class_name)
     return int(match.group(1)) if match else 999
 
 
 def _test_title(test_name: str) -> str:
-    stripped = re.sub(r"^test_\d+_", "", test_name)
+    stripped = _TEST_TITLE_RE.sub("", test_name)
     return stripped.replace("_", " ").capitalize()
 
 
-def _fence_for(content: str) -> str:
+def _fence_for(content: bytes) -> bytes:
     """Return a backtick fence longer than any backtick run in *content*."""
-    max_run = max((len(m.group()) for m in re.finditer(r"`+", content)), default=0)
-    return "`" * max(3, max_run + 1)
+    max_run = max((len(m.group()) for m in _BACKTICK_RUN_RE.finditer(content)), default=0)
+    return b"`" * max(3, max_run + 1)
+
+
+def _read_approved(path: Path) -> bytes:
+    # Approved files are UTF-8 and so is the report: copy the bytes without decoding
+    return path.read_bytes().strip()
 
 
 def generate_report(*, title: str, approved_dir: Path, output_path: Path) -> None:
     """Generate a SCENARIOS markdown file from approved test output files."""
-    entries: list[tuple[str | None, str, Path]] = []
-    for path in approved_dir.glob("*.approved.txt"):
-        class_name, test_name = _parse_approved_filename(path.name)
-        entries.append((class_name, test_name, path))
+    # (section order, section title, test order, test name, path), sorted once and grouped by section
+    entries: list[tuple[int, str, int, str, Path]] = []
+    # Section order and title depend only on the class, which several tests share
+    sections: dict[str | None, tuple[int, str]] = {}
+    # A plain suffix check on the scandir listing; no fnmatch per entry as with glob()
+    try:
+        it = os.scandir(approved_dir)
+    except FileNotFoundError:
+        return  # a suite with nothing approved yet has no report
+    with it:
+        for entry in it:
+            if not entry.name.endswith(".approved.txt"):
+                continue
+            class_name, test_name = _parse_approved_filename(entry.name)
+            section = sections.get(class_name)
+            if section is None:
+                section = sections[class_name] = (_class_sort_key(class_name), _class_to_section(class_name))
+            entries.append((*section, _test_sort_key(test_name), test_name, Path(entry.path)))
 
     if not entries:
         return
 
-    sections: dict[str, list[tuple[str, Path]]] = {}
-    section_sort_keys: dict[str, int] = {}
-    for class_name, test_name, path in entries:
-        section = _class_to_section(class_name)
-        sections.setdefault(section, []).append((test_name, path))
-        section_sort_keys.setdefault(section, _class_sort_key(class_name))
+    entries.sort()
 
-    for section in sections:
-        sections[section].sort(key=lambda t: _test_sort_key(t[0]))
+    # Read every approved file up front, concurrently: file reads release the GIL
+    paths = [entry[4] for entry in entries]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        contents = dict(zip(paths, executor.map(_read_approved, paths), strict=True))
 
-    sorted_sections = sorted(sections.keys(), key=lambda s: section_sort_keys.get(s, 999))
-
-    lines = [f"# {title}\n", AUTOGEN_HEADER]
+    # Assemble the report in memory, then write it out in one go
+    buf = bytearray(f"# {title}\n\n{AUTOGEN_HEADER}\n".encode())
     scenario_num = 1
-
-    for section_title in sorted_sections:
-        tests = sections[section_title]
-        lines.append(f"\n## {section_title}\n")
-        for test_name, path in tests:
-            content = path.read_text().strip()
+    for (_, section_title), tests in groupby(entries, key=itemgetter(0, 1)):
+        buf += f"\n## {section_title}\n\n".encode()
+        for _, _, _, test_name, path in tests:
+            content = contents[path]
             fence = _fence_for(content)
-            title_text = _test_title(test_name)
-            lines.append(f"### {scenario_num}. {title_text}\n")
-            lines.append(f"{fence}\n{content}\n{fence}\n")
+            buf += f"### {scenario_num}. {_test_title(test_name)}\n\n".encode()
+            buf += b"%s\n%s\n%s\n\n" % (fence, content, fence)
             scenario_num += 1
 
-    output_path.write_text("\n".join(lines) + "\n")
+    report = bytes(buf)
+    # Leave an up-to-date report untouched, so its mtime only moves when it changes
+    with contextlib.suppress(FileNotFoundError):
+        if output_path.read_bytes() == report:
+            return
+    output_path.write_bytes(report)
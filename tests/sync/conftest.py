@@ -1,23 +1,74 @@
 """Pytest configuration for sync e2e tests.
 
-Routes approved/received files to the approved_files/ subdirectory
-and generates SCENARIOS-sync.md after each test run.
+Provides the briefcase and target fixtures, and keeps every scenario from
+running real git. SCENARIOS-sync.md is generated by tests/conftest.py.
 """
 
 from __future__ import annotations
 
+import subprocess
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
 
-from tests.scenario_report import generate_report
+import pytest
 
-SUITE_DIR = Path(__file__).parent
-APPROVED_DIR = SUITE_DIR / "approved_files"
-SCENARIOS_MD = SUITE_DIR.parents[1] / "SCENARIOS-sync.md"
+import briefcase_sync
+from tests.scenario_helpers import copy_template
 
+_real_run = subprocess.run
 
-def pytest_sessionfinish(session, exitstatus):
-    generate_report(
-        title="Briefcase-Sync Scenarios",
-        approved_dir=APPROVED_DIR,
-        output_path=SCENARIOS_MD,
-    )
+
+def _run_without_git(cmd, *args, **kwargs):
+    """subprocess.run stand-in: git fails as it would outside a repo; anything else really runs."""
+    if cmd[0] == "git":
+        raise subprocess.CalledProcessError(128, cmd)
+    return _real_run(cmd, *args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def no_git():
+    """Keep scenarios from spawning git; staleness scenarios install their own fake on top."""
+    with patch("subprocess.run", _run_without_git):
+        yield
+
+
+@pytest.fixture(scope="session")
+def briefcase_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A minimal briefcase (config/_shared/CLAUDE.md only), written once per session."""
+    template_dir = tmp_path_factory.mktemp("template") / "briefcase"
+    rules = template_dir / "config" / "_shared" / "CLAUDE.md"
+    rules.parent.mkdir(parents=True)
+    rules.write_text("# rules")
+    return template_dir
+
+
+@pytest.fixture
+def briefcase(briefcase_template: Path, tmp_path: Path) -> Path:
+    """A private copy of the template briefcase, placed beside the test's target dir."""
+    return copy_template(briefcase_template, tmp_path / "briefcase")
+
+
+@pytest.fixture
+def target(tmp_path: Path) -> Path:
+    """An empty target project directory, my-project/, next to the briefcase."""
+    target_dir = tmp_path / "my-project"
+    target_dir.mkdir()
+    return target_dir
+
+
+@pytest.fixture(scope="session")
+def synced_target_template(briefcase_template: Path, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """my-project/ as one sync from the template briefcase leaves it, made once per session."""
+    target_dir = tmp_path_factory.mktemp("synced") / "my-project"
+    target_dir.mkdir()
+    argv = ["--briefcase", str(briefcase_template), "--project", target_dir.name]
+    with patch("subprocess.run", _run_without_git):
+        briefcase_sync.main(argv, cwd=target_dir, stdout=StringIO(), stderr=StringIO())
+    return target_dir
+
+
+@pytest.fixture
+def synced_target(synced_target_template: Path, tmp_path: Path) -> Path:
+    """A private copy of synced_target_template, for scenarios that start from a first sync."""
+    return copy_template(synced_target_template, tmp_path / "my-project")
@@ -2,24 +2,27 @@
 
 from __future__ import annotations
 
-import json
 import os
+import re
 import stat
 import subprocess
-import textwrap
+from collections import namedtuple
+from contextlib import nullcontext
 from io import StringIO
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from approvaltests import verify
-from approvaltests.storyboard import Storyboard
 
 import briefcase_sync
+from tests.scenario_helpers import add_result, file_tree, format_output, scenario, write_file, write_files
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+SOURCE_COMMIT_RE = re.compile(r'("source_commit": )"[^"]*"')
+
 
 def run_sync(
     briefcase_dir: Path,
@@ -28,7 +31,7 @@ def run_sync(
     shared: str = "_shared",
     subprocess_side_effect: object = None,
 ) -> tuple[int, str, str]:
-    """Run briefcase_sync.main() inside target_dir, capturing stdout/stderr.
+    """Run briefcase_sync.main() against target_dir, capturing stdout/stderr.
 
     If subprocess_side_effect is given, subprocess.run is mocked with that
     side_effect (useful for controlling git commands in staleness tests).
@@ -37,17 +40,11 @@ def run_sync(
     argv = ["--briefcase", str(briefcase_dir), "--project", project, "--shared", shared]
 
     stdout, stderr = StringIO(), StringIO()
-    original_cwd = os.getcwd()
-    try:
-        os.chdir(target_dir)
-        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
-            if subprocess_side_effect is not None:
-                with patch("subprocess.run", side_effect=subprocess_side_effect):
-                    exit_code = briefcase_sync.main(argv)
-            else:
-                exit_code = briefcase_sync.main(argv)
-    finally:
-        os.chdir(original_cwd)
+    git = (
+        nullcontext() if subprocess_side_effect is None else patch("subprocess.run", side_effect=subprocess_side_effect)
+    )
+    with git:
+        exit_code = briefcase_sync.main(argv, cwd=target_dir, stdout=stdout, stderr=stderr)
 
     # Scrub absolute tmp paths so approved files are stable across runs
     tmp_root = str(target_dir.parent)
@@ -58,59 +55,22 @@ def run_sync(
     )
 
 
-def write_file(path: Path, content: str = "") -> None:
-    """Create a file with content, making parent dirs as needed."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content)
-
-
-def target_tree(target_dir: Path) -> str:
-    """Tree of the target dir files."""
-    lines = []
-    for entry in sorted(target_dir.rglob("*")):
-        if entry.is_file():
-            rel = entry.relative_to(target_dir)
-            lines.append(str(rel))
-    return "\n".join(lines) if lines else "(empty)"
-
-
-def format_output(text: str) -> str:
-    """Format captured output for the storyboard."""
-    if not text.strip():
-        return "(empty)"
-    return textwrap.indent(text.rstrip(), "  ")
-
-
 def read_lock_data(target_dir: Path) -> str:
     """Read and format lock file contents, scrubbing the commit hash."""
-    lock_path = target_dir / ".briefcase.lock"
-    if not lock_path.exists():
+    try:
+        text = (target_dir / ".briefcase.lock").read_text()
+    except FileNotFoundError:
         return "(no lock file)"
-    data = json.loads(lock_path.read_text())
-    data["source_commit"] = "<commit>"
-    return json.dumps(data, indent=2, sort_keys=True)
+    # The lock is written canonically (indent=2, sorted keys), so scrub it as text
+    return SOURCE_COMMIT_RE.sub(r'\1"<commit>"', text).rstrip()
 
 
 def read_gitignore(target_dir: Path) -> str:
     """Read .gitignore contents."""
-    gi = target_dir / ".gitignore"
-    if not gi.exists():
+    try:
+        return (target_dir / ".gitignore").read_text().rstrip()
+    except FileNotFoundError:
         return "(no .gitignore)"
-    return gi.read_text().rstrip()
-
-
-def scenario(description: str) -> Storyboard:
-    """Start a new storyboard with a scenario description."""
-    story = Storyboard()
-    story.add_description(f"Scenario: {description}")
-    return story
-
-
-def add_result(story: Storyboard, exit_code: int, stdout: str, stderr: str) -> None:
-    """Add the standard result frames to a storyboard."""
-    story.add_frame(format_output(stdout), "stdout")
-    story.add_frame(format_output(stderr), "stderr")
-    story.add_frame(exit_code, "exit code")
 
 
 # ---------------------------------------------------------------------------
@@ -119,13 +79,12 @@ def add_result(story: Storyboard, exit_code: int, stdout: str, stderr: str) -> N
 
 
 class TestCoreSync_1:
-    def test_1_fresh_sync_copies_all_files(self, tmp_path: Path) -> None:
+    def test_1_fresh_sync_copies_all_files(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# shared rules")
-        write_file(briefcase / "config" / "_shared" / ".claude" / "commands" / "review.md", "/review command")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        write_files(
+            briefcase / "config",
+            {"_shared/CLAUDE.md": "# shared rules", "_shared/.claude/commands/review.md": "/review command"},
+        )
 
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
@@ -135,56 +94,44 @@ class TestCoreSync_1:
             "Briefcase contents",
         )
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         story.add_frame(read_gitignore(target), ".gitignore")
         verify(story)
 
-    def test_2_incremental_sync_new_file_added(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
-        run_sync(briefcase, target)
+    def test_2_incremental_sync_new_file_added(self, briefcase: Path, synced_target: Path) -> None:
+        target = synced_target
         write_file(briefcase / "config" / "_shared" / "new-file.md", "# new content")
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
         story = scenario("Incremental sync picks up newly added files")
         story.add_frame("CLAUDE.md (already synced)\nnew-file.md (just added)", "Briefcase contents")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         verify(story)
 
-    def test_3_incremental_sync_file_removed(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-        write_file(briefcase / "config" / "_shared" / ".claude" / "commands" / "review.md", "/review")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+    def test_3_incremental_sync_file_removed(self, briefcase: Path, target: Path) -> None:
+        review = briefcase / "config" / "_shared" / ".claude" / "commands" / "review.md"
+        write_file(review, "/review")
 
         run_sync(briefcase, target)
-        (briefcase / "config" / "_shared" / ".claude" / "commands" / "review.md").unlink()
+        review.unlink()
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
         story = scenario("Removing a file from the briefcase cleans it up in the target")
         story.add_frame("CLAUDE.md (kept)\n.claude/commands/review.md (removed from briefcase)", "Briefcase change")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         story.add_frame(read_gitignore(target), ".gitignore")
         verify(story)
 
-    def test_4_incremental_sync_file_updated(self, tmp_path: Path) -> None:
+    def test_4_incremental_sync_file_updated(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# version 1")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        shared_claude = briefcase / "config" / "_shared" / "CLAUDE.md"
+        write_file(shared_claude, "# version 1")
 
         run_sync(briefcase, target)
         content_before = (target / "CLAUDE.md").read_text()
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# version 2")
+        write_file(shared_claude, "# version 2")
         exit_code, stdout, stderr = run_sync(briefcase, target)
         content_after = (target / "CLAUDE.md").read_text()
 
@@ -193,30 +140,43 @@ class TestCoreSync_1:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
+    def test_5_incremental_sync_mode_change(self, tmp_path: Path, target: Path) -> None:
+        briefcase = tmp_path / "briefcase"
+        script = briefcase / "config" / "_shared" / "setup.sh"
+        write_file(script, "echo setup")
+        script.chmod(0o644)
+
+        run_sync(briefcase, target)
+        mode_before = stat.S_IMODE((target / "setup.sh").stat().st_mode)
+        script.chmod(0o755)
+        exit_code, stdout, stderr = run_sync(briefcase, target)
+        mode_after = stat.S_IMODE((target / "setup.sh").stat().st_mode)
+
+        story = scenario("A mode change on an otherwise unchanged briefcase file reaches the target")
+        story.add_frame(f"before: {mode_before:o}\nafter:  {mode_after:o}", "setup.sh mode")
+        add_result(story, exit_code, stdout, stderr)
+        verify(story)
+
 
 class TestLayeringAndOverrides_2:
-    def test_1_shared_only_sync(self, tmp_path: Path) -> None:
+    def test_1_shared_only_sync(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
         write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# shared config")
 
-        target = tmp_path / "my-project"
-        target.mkdir()
-
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
         story = scenario("Files sync from _shared/ when no project-specific folder exists")
         story.add_frame("briefcase/_shared/CLAUDE.md\n(no my-project/ folder)", "Briefcase contents")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         verify(story)
 
-    def test_2_project_overrides_shared(self, tmp_path: Path) -> None:
+    def test_2_project_overrides_shared(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# shared version")
-        write_file(briefcase / "config" / "my-project" / "CLAUDE.md", "# project-specific version")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        write_files(
+            briefcase / "config",
+            {"_shared/CLAUDE.md": "# shared version", "my-project/CLAUDE.md": "# project-specific version"},
+        )
 
         exit_code, stdout, stderr = run_sync(briefcase, target)
         synced_content = (target / "CLAUDE.md").read_text()
@@ -230,13 +190,15 @@ class TestLayeringAndOverrides_2:
         story.add_frame(synced_content, "CLAUDE.md in target (project wins)")
         verify(story)
 
-    def test_3_mixed_shared_and_project_files(self, tmp_path: Path) -> None:
+    def test_3_mixed_shared_and_project_files(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / ".claude" / "commands" / "review.md", "/review from shared")
-        write_file(briefcase / "config" / "my-project" / "CLAUDE.md", "# project CLAUDE.md")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        write_files(
+            briefcase / "config",
+            {
+                "_shared/.claude/commands/review.md": "/review from shared",
+                "my-project/CLAUDE.md": "# project CLAUDE.md",
+            },
+        )
 
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
@@ -246,21 +208,19 @@ class TestLayeringAndOverrides_2:
             "Briefcase contents",
         )
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         verify(story)
 
 
 class TestLocalModificationProtection_3:
-    def test_1_locally_modified_file_is_preserved(self, tmp_path: Path) -> None:
+    def test_1_locally_modified_file_is_preserved(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# from briefcase")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        shared_claude = briefcase / "config" / "_shared" / "CLAUDE.md"
+        write_file(shared_claude, "# from briefcase")
 
         run_sync(briefcase, target)
         (target / "CLAUDE.md").write_text("# my local edits")
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# updated in briefcase")
+        write_file(shared_claude, "# updated in briefcase")
         exit_code, stdout, stderr = run_sync(briefcase, target)
         final_content = (target / "CLAUDE.md").read_text()
 
@@ -273,15 +233,13 @@ class TestLocalModificationProtection_3:
         story.add_frame(final_content, "CLAUDE.md in target (local edit preserved)")
         verify(story)
 
-    def test_2_unmodified_file_is_updated(self, tmp_path: Path) -> None:
+    def test_2_unmodified_file_is_updated(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# v1")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        shared_claude = briefcase / "config" / "_shared" / "CLAUDE.md"
+        write_file(shared_claude, "# v1")
 
         run_sync(briefcase, target)
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# v2")
+        write_file(shared_claude, "# v2")
         exit_code, stdout, stderr = run_sync(briefcase, target)
         final_content = (target / "CLAUDE.md").read_text()
 
@@ -292,31 +250,22 @@ class TestLocalModificationProtection_3:
 
 
 class TestGitignoreManagement_4:
-    def test_1_synced_files_added_to_gitignore(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
+    def test_1_synced_files_added_to_gitignore(self, briefcase: Path, target: Path) -> None:
         write_file(briefcase / "config" / "_shared" / ".claude" / "commands" / "review.md", "/review")
 
-        target = tmp_path / "my-project"
-        target.mkdir()
-
         run_sync(briefcase, target)
 
         story = scenario("All synced files appear in a managed .gitignore section")
         story.add_frame(read_gitignore(target), ".gitignore")
         verify(story)
 
-    def test_2_removed_files_cleaned_from_gitignore(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-        write_file(briefcase / "config" / "_shared" / "extra.md", "# extra")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+    def test_2_removed_files_cleaned_from_gitignore(self, briefcase: Path, target: Path) -> None:
+        extra = briefcase / "config" / "_shared" / "extra.md"
+        write_file(extra, "# extra")
 
         run_sync(briefcase, target)
         gitignore_before = read_gitignore(target)
-        (briefcase / "config" / "_shared" / "extra.md").unlink()
+        extra.unlink()
         run_sync(briefcase, target)
         gitignore_after = read_gitignore(target)
 
@@ -325,12 +274,7 @@ class TestGitignoreManagement_4:
         story.add_frame(gitignore_after, ".gitignore after (extra.md removed)")
         verify(story)
 
-    def test_3_existing_gitignore_content_preserved(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+    def test_3_existing_gitignore_content_preserved(self, briefcase: Path, target: Path) -> None:
         (target / ".gitignore").write_text("node_modules/\n.env\n")
 
         run_sync(briefcase, target)
@@ -341,13 +285,7 @@ class TestGitignoreManagement_4:
 
 
 class TestPostSyncHook_5:
-    def test_1_post_sync_hook_runs(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_1_post_sync_hook_runs(self, briefcase: Path, target: Path) -> None:
         hook = target / ".briefcase-post-sync.sh"
         hook.write_text("#!/bin/bash\necho 'hook-was-here' > .post-sync-marker\n")
         hook.chmod(hook.stat().st_mode | stat.S_IEXEC)
@@ -362,13 +300,7 @@ class TestPostSyncHook_5:
         story.add_frame(marker_content, ".post-sync-marker content")
         verify(story)
 
-    def test_2_no_post_sync_hook_is_noop(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_2_no_post_sync_hook_is_noop(self, briefcase: Path, target: Path) -> None:
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
         story = scenario("Sync completes normally when no post-sync hook exists")
@@ -378,10 +310,8 @@ class TestPostSyncHook_5:
 
 
 class TestGracefulDegradation_6:
-    def test_1_missing_briefcase_repo(self, tmp_path: Path) -> None:
+    def test_1_missing_briefcase_repo(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "nonexistent-briefcase"
-        target = tmp_path / "my-project"
-        target.mkdir()
 
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
@@ -389,13 +319,10 @@ class TestGracefulDegradation_6:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
-    def test_2_empty_briefcase_emits_warning(self, tmp_path: Path) -> None:
+    def test_2_empty_briefcase_emits_warning(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
         briefcase.mkdir()
 
-        target = tmp_path / "my-project"
-        target.mkdir()
-
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
         story = scenario("Empty briefcase emits a warning")
@@ -405,13 +332,10 @@ class TestGracefulDegradation_6:
 
 
 class TestCLIConfiguration_7:
-    def test_1_custom_briefcase_path(self, tmp_path: Path) -> None:
+    def test_1_custom_briefcase_path(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "somewhere" / "else" / "my-briefcase"
         write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# from custom path")
 
-        target = tmp_path / "my-project"
-        target.mkdir()
-
         exit_code, stdout, stderr = run_sync(briefcase, target)
         synced_content = (target / "CLAUDE.md").read_text()
 
@@ -421,13 +345,10 @@ class TestCLIConfiguration_7:
         story.add_frame(synced_content, "CLAUDE.md content")
         verify(story)
 
-    def test_2_custom_project_name(self, tmp_path: Path) -> None:
+    def test_2_custom_project_name(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
         write_file(briefcase / "config" / "custom-name" / "CLAUDE.md", "# for custom-name project")
 
-        target = tmp_path / "my-project"
-        target.mkdir()
-
         exit_code, stdout, stderr = run_sync(briefcase, target, project_name="custom-name")
         synced_content = (target / "CLAUDE.md").read_text()
 
@@ -440,7 +361,7 @@ class TestCLIConfiguration_7:
         story.add_frame(synced_content, "CLAUDE.md content")
         verify(story)
 
-    def test_3_env_var_overrides_cli_briefcase_path(self, tmp_path: Path) -> None:
+    def test_3_env_var_overrides_cli_briefcase_path(self, tmp_path: Path, target: Path) -> None:
         """BRIEFCASE_PATH env var takes precedence over --briefcase."""
         cli_briefcase = tmp_path / "cli-briefcase"
         write_file(cli_briefcase / "config" / "_shared" / "CLAUDE.md", "# from CLI path")
@@ -448,9 +369,6 @@ class TestCLIConfiguration_7:
         env_briefcase = tmp_path / "env-briefcase"
         write_file(env_briefcase / "config" / "_shared" / "CLAUDE.md", "# from BRIEFCASE_PATH")
 
-        target = tmp_path / "my-project"
-        target.mkdir()
-
         with patch.dict(os.environ, {"BRIEFCASE_PATH": str(env_briefcase)}):
             exit_code, stdout, stderr = run_sync(cli_briefcase, target)
         synced_content = (target / "CLAUDE.md").read_text()
@@ -465,13 +383,12 @@ class TestCLIConfiguration_7:
         story.add_frame(synced_content, "CLAUDE.md content (env var wins)")
         verify(story)
 
-    def test_4_custom_shared_name(self, tmp_path: Path) -> None:
+    def test_4_custom_shared_name(self, tmp_path: Path, target: Path) -> None:
         briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "common" / "CLAUDE.md", "# from common/")
-        write_file(briefcase / "config" / "_shared" / "IGNORED.md", "# should not sync")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
+        write_files(
+            briefcase / "config",
+            {"common/CLAUDE.md": "# from common/", "_shared/IGNORED.md": "# should not sync"},
+        )
 
         exit_code, stdout, stderr = run_sync(briefcase, target, shared="common")
 
@@ -481,37 +398,25 @@ class TestCLIConfiguration_7:
             "Briefcase contents",
         )
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         verify(story)
 
 
 class TestLockFileIntegrity_8:
-    def test_1_lock_file_records_state(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_1_lock_file_records_state(self, briefcase: Path, target: Path) -> None:
         run_sync(briefcase, target)
 
         story = scenario("Lock file records source commit and file hashes after sync")
         story.add_frame(read_lock_data(target), ".briefcase.lock")
         verify(story)
 
-    def test_2_idempotent_sync_no_changes(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
-        run_sync(briefcase, target)
+    def test_2_idempotent_sync_no_changes(self, briefcase: Path, synced_target: Path) -> None:
+        target = synced_target
         exit_code, stdout, stderr = run_sync(briefcase, target)
 
         story = scenario("Re-running sync with no changes is idempotent")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory (unchanged)")
+        story.add_frame(file_tree(target), "Target directory (unchanged)")
         verify(story)
 
 
@@ -520,6 +425,10 @@ class TestLockFileIntegrity_8:
 # ---------------------------------------------------------------------------
 
 
+# Stand-in for subprocess.CompletedProcess: sync only reads .stdout and .returncode
+_FakeProc = namedtuple("_FakeProc", "stdout returncode", defaults=("", 0))
+
+
 def _git_mock(
     *,
     local_sha: str = "aaa1111",
@@ -530,58 +439,41 @@ def _git_mock(
     no_remote_ref: bool = False,
 ):
     """Build a subprocess.run side_effect that simulates git staleness scenarios."""
+    head = _FakeProc(stdout=local_sha + "\n")
+    behind = _FakeProc(stdout=("0" if remote_sha in (None, local_sha) else behind_count) + "\n")
 
     def fake_run(cmd, **kwargs):
-        cmd_str = " ".join(cmd)
-        if not_a_repo and ("rev-parse" in cmd_str or "fetch" in cmd_str):
+        # briefcase_sync runs git as: git -C <briefcase_dir> <subcommand> ...
+        subcommand = cmd[3] if cmd[0] == "git" else None
+        if not_a_repo and subcommand in ("rev-parse", "fetch"):
             raise subprocess.CalledProcessError(128, cmd)
-        if "fetch" in cmd_str:
+        if subcommand == "fetch":
             if fetch_fails:
                 raise subprocess.CalledProcessError(1, cmd)
-            return MagicMock(returncode=0)
-        if "rev-parse HEAD" in cmd_str:
-            result = MagicMock()
-            result.stdout = local_sha + "\n"
-            return result
-        if "rev-parse origin/" in cmd_str:
+            return _FakeProc()
+        if subcommand == "rev-parse":
+            return head
+        if subcommand == "rev-list":
             if no_remote_ref:
                 raise subprocess.CalledProcessError(128, cmd)
-            result = MagicMock()
-            result.stdout = (remote_sha or local_sha) + "\n"
-            return result
-        if "rev-list --count" in cmd_str:
-            result = MagicMock()
-            result.stdout = behind_count + "\n"
-            return result
-        return MagicMock()
+            return behind
+        return _FakeProc()
 
     return fake_run
 
 
 class TestStalenessDetection_9:
-    def test_1_warns_when_briefcase_is_behind_remote(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_1_warns_when_briefcase_is_behind_remote(self, briefcase: Path, target: Path) -> None:
         mock = _git_mock(local_sha="aaa1111", remote_sha="bbb2222", behind_count="3")
         exit_code, stdout, stderr = run_sync(briefcase, target, subprocess_side_effect=mock)
 
         story = scenario("Stale briefcase emits a warning but sync proceeds normally")
         story.add_frame("local HEAD: aaa1111\nremote HEAD: bbb2222 (3 commits ahead)", "Briefcase git state")
         add_result(story, exit_code, stdout, stderr)
-        story.add_frame(target_tree(target), "Target directory after sync")
+        story.add_frame(file_tree(target), "Target directory after sync")
         verify(story)
 
-    def test_2_no_warning_when_up_to_date(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_2_no_warning_when_up_to_date(self, briefcase: Path, target: Path) -> None:
         mock = _git_mock(local_sha="aaa1111", remote_sha="aaa1111")
         exit_code, stdout, stderr = run_sync(briefcase, target, subprocess_side_effect=mock)
 
@@ -590,13 +482,7 @@ class TestStalenessDetection_9:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
-    def test_3_no_warning_when_fetch_fails(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_3_no_warning_when_fetch_fails(self, briefcase: Path, target: Path) -> None:
         mock = _git_mock(fetch_fails=True)
         exit_code, stdout, stderr = run_sync(briefcase, target, subprocess_side_effect=mock)
 
@@ -605,13 +491,7 @@ class TestStalenessDetection_9:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
-    def test_4_no_warning_when_not_a_git_repo(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_4_no_warning_when_not_a_git_repo(self, briefcase: Path, target: Path) -> None:
         mock = _git_mock(not_a_repo=True)
         exit_code, stdout, stderr = run_sync(briefcase, target, subprocess_side_effect=mock)
 
@@ -620,13 +500,7 @@ class TestStalenessDetection_9:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
-    def test_5_no_warning_when_local_is_ahead_of_remote(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_5_no_warning_when_local_is_ahead_of_remote(self, briefcase: Path, target: Path) -> None:
         mock = _git_mock(local_sha="ccc3333", remote_sha="aaa1111", behind_count="0")
         exit_code, stdout, stderr = run_sync(briefcase, target, subprocess_side_effect=mock)
 
@@ -635,13 +509,7 @@ class TestStalenessDetection_9:
         add_result(story, exit_code, stdout, stderr)
         verify(story)
 
-    def test_6_no_warning_when_remote_ref_not_found(self, tmp_path: Path) -> None:
-        briefcase = tmp_path / "briefcase"
-        write_file(briefcase / "config" / "_shared" / "CLAUDE.md", "# rules")
-
-        target = tmp_path / "my-project"
-        target.mkdir()
-
+    def test_6_no_warning_when_remote_ref_not_found(self, briefcase: Path, target: Path) -> None:
         mock = _git_mock(no_remote_ref=True)
         exit_code, stdout, stderr = run_sync(briefcase, target, subprocess_side_effect=mock)
 
@@ -655,11 +523,12 @@ class TestSymlinkSupport_10:
     def test_1_symlinked_project_files_are_synced_as_copies(self, tmp_path: Path) -> None:
         briefcase = tmp_path / "briefcase"
         # No _shared/AGENTS.md — projectA owns the canonical file
-        write_file(briefcase / "config" / "projectA" / "AGENTS.md", "# projectA agent rules")
+        config = briefcase / "config"
+        write_file(config / "projectA" / "AGENTS.md", "# projectA agent rules")
 
         # projectB symlinks to projectA's file instead of duplicating it
-        (briefcase / "config" / "projectB").mkdir(parents=True)
-        (briefcase / "config" / "projectB" / "AGENTS.md").symlink_to(briefcase / "config" / "projectA" / "AGENTS.md")
+        (config / "projectB").mkdir(parents=True)
+        (config / "projectB" / "AGENTS.md").symlink_to(config / "projectA" / "AGENTS.md")
 
         target_a = tmp_path / "projectA"
         target_a.mkdir()
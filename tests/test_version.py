@@ -7,47 +7,93 @@ the version declared in pyproject.toml.  Files that use placeholders (like
 
 from __future__ import annotations
 
+import os
 import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+# Scanned paths are plain strings under ROOT; slicing this off gives the relative path
+ROOT_PREFIX_LEN = len(str(ROOT)) + len(os.sep)
 
+SCAN_EXTS = frozenset({".md", ".yaml", ".yml", ".txt", ".toml"})
 SKIP_DIRS = {".nox", ".venv", ".git", "node_modules", "__pycache__"}
 SKIP_FILES = {
     ".pre-commit-config.yaml",  # references third-party hooks, not our version
 }
 # Auto-generated from approved files; the source of truth is the approved file.
 SKIP_PREFIXES = ("SCENARIOS-",)
+# Written and deleted by approval tests while they run, possibly on other xdist workers.
+SKIP_SUFFIXES = (".received.txt",)
 
-REV_RE = re.compile(r"rev:\s*v(\d+\.\d+\.\d+)")
+# Matched against whole files, so the gap before "v" must not run onto the next line
+REV_RE = re.compile(rb"rev:[ \t]*v(\d+\.\d+\.\d+)")
+VERSION_RE = re.compile(rb'^version\s*=\s*"(.+?)"', re.MULTILINE)
 
 
+@cache
 def _pyproject_version() -> str:
-    text = (ROOT / "pyproject.toml").read_text()
-    match = re.search(r'^version\s*=\s*"(.+?)"', text, re.MULTILINE)
+    data = (ROOT / "pyproject.toml").read_bytes()
+    match = VERSION_RE.search(data)
     assert match, "version not found in pyproject.toml"
-    return match.group(1)
+    return match.group(1).decode()
 
 
-def _find_rev_references() -> list[tuple[str, int, str]]:
-    """Return (relative_path, line_number, found_version) for every rev: vX.Y.Z."""
-    hits: list[tuple[str, int, str]] = []
-    for path in sorted(ROOT.rglob("*")):
-        if any(part in SKIP_DIRS for part in path.parts):
-            continue
-        if not path.is_file() or path.suffix not in {".md", ".yaml", ".yml", ".txt", ".toml"}:
-            continue
-        if path.name in SKIP_FILES or any(path.name.startswith(p) for p in SKIP_PREFIXES):
+def _walk_files(root: Path | str) -> Iterator[os.DirEntry[str]]:
+    """Yield every file under root in path order, never descending into SKIP_DIRS."""
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                yield from _walk_files(entry.path)
+        elif entry.is_file():
+            yield entry
+
+
+def _scan_file(path: str) -> list[tuple[str, int, str]]:
+    """Return (relative_path, line_number, found_version) for every rev: vX.Y.Z in path."""
+    try:
+        # Unbuffered: the whole file is wanted, so read it straight into one bytes object
+        with open(path, "rb", buffering=0) as f:
+            data = f.read()
+    except (FileNotFoundError, PermissionError):
+        # Deleted since the walk listed it, or unreadable
+        return []
+    # Skip the regex for files that cannot contain a reference
+    if b"rev:" not in data:
+        return []
+    # One pass of the regex over the raw bytes. Line numbers are only worked out for
+    # hits, counting on from the previous hit so the file is counted through once.
+    hits = []
+    lineno, pos = 1, 0
+    for m in REV_RE.finditer(data):
+        lineno += data.count(b"\n", pos, m.start())
+        pos = m.start()
+        hits.append((path[ROOT_PREFIX_LEN:], lineno, m.group(1).decode()))
+    return hits
+
+
+@cache
+def _find_rev_references() -> tuple[tuple[str, int, str], ...]:
+    """Return (relative_path, line_number, found_version) for every rev: vX.Y.Z.
+
+    Cached like _pyproject_version, so the tree is scanned once per session; the
+    result is a tuple so callers cannot change the cached copy.
+    """
+    paths = []
+    for entry in _walk_files(ROOT):
+        name = entry.name
+        if os.path.splitext(name)[1] not in SCAN_EXTS:
             continue
-        try:
-            text = path.read_text()
-        except (UnicodeDecodeError, PermissionError):
+        if name in SKIP_FILES or name.startswith(SKIP_PREFIXES) or name.endswith(SKIP_SUFFIXES):
             continue
-        for lineno, line in enumerate(text.splitlines(), start=1):
-            m = REV_RE.search(line)
-            if m:
-                hits.append((str(path.relative_to(ROOT)), lineno, m.group(1)))
-    return hits
+        paths.append(entry.path)
+    # map() yields results in path order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return tuple(hit for file_hits in executor.map(_scan_file, paths) for hit in file_hits)
 
 
 def test_all_rev_references_match_pyproject_version():